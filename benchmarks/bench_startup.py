@@ -0,0 +1,101 @@
+"""Startup benchmark for the store sweep.
+
+Measures what every run pays before the first test starts: importing
+test_freedom_pay (which pulls in conftest) and parsing the store list.
+Heavy browser dependencies must not be imported at this stage.
+
+    python benchmarks/bench_startup.py [--rows 50000] [--repeat 5]
+"""
+import argparse
+import csv
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ('selenium', 'webdriver_manager', 'requests')
+
+IMPORT_PROBE = """
+import sys, time
+start = time.perf_counter()
+import test_freedom_pay
+elapsed = time.perf_counter() - start
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(f"{{elapsed:.6f}} {{','.join(heavy)}}")
+"""
+
+
+def measure_import(repeat: int):
+    timings = []
+    heavy = set()
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', IMPORT_PROBE.format(heavy=HEAVY_MODULES)],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.split()
+        timings.append(float(output[0]))
+        if len(output) > 1:
+            heavy.update(output[1].split(','))
+    return min(timings), sorted(heavy)
+
+
+def write_synthetic_stores(path: str, rows: int):
+    with open(os.path.join(ROOT, 'src', 'data', 'stores.csv'), 'r', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        template = next(reader)
+
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for i in range(rows):
+            row = list(template)
+            row[1] = str(16000000000 + i)
+            row[2] = str(26000000000 + i)
+            writer.writerow(row)
+
+
+def measure_parse(rows: int, repeat: int):
+    sys.path.insert(0, ROOT)
+    from test_freedom_pay import read_store_data
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'stores.csv')
+        write_synthetic_stores(path, rows)
+
+        timings = []
+        for _ in range(repeat):
+            read_store_data.cache_clear()
+            start = time.perf_counter()
+            read_store_data(path)
+            timings.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        read_store_data(path)
+        cached = time.perf_counter() - start
+
+    return min(timings), cached
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=50000, help='Synthetic store rows to parse')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement (best is reported)')
+    args = parser.parse_args()
+
+    import_time, heavy = measure_import(args.repeat)
+    parse_time, cached_time = measure_parse(args.rows, args.repeat)
+
+    print(f"import test_freedom_pay: {import_time * 1000:.1f} ms")
+    print(f"read_store_data ({args.rows} rows): {parse_time * 1000:.1f} ms "
+          f"({parse_time / args.rows * 1e6:.2f} us/row), cached: {cached_time * 1e6:.1f} us")
+
+    if heavy:
+        print(f"FAIL: heavy modules imported at startup: {', '.join(heavy)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
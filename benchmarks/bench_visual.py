@@ -0,0 +1,79 @@
+"""Benchmark for checkout card hash comparisons.
+
+Builds a synthetic baseline set spread over properties and saves it, then
+compares a full sweep of stores against a freshly loaded store: half with
+their own baseline and half falling back to their property's baselines.
+
+Two paths are measured:
+
+- per store: one comparison per store, as compare() does during a
+  --visual-check sweep; each is vectorized over that store's property only
+- compare_many: the whole sweep in one batch, for offline re-checks of
+  collected hashes
+
+    python benchmarks/bench_visual.py [--stores 5000] [--properties 100]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.utils.visual_regression import VisualBaselineStore  # noqa: E402
+
+
+def best_of(repeat, run):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--stores', type=int, default=5000, help='Stores in the sweep')
+    parser.add_argument('--properties', type=int, default=100, help='Distinct property IDs')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement (best is reported)')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    hashes = [int(h) for h in rng.integers(0, 2 ** 63, size=args.stores, dtype=np.uint64)]
+    store_ids = [str(16000000000 + i) for i in range(args.stores)]
+    property_ids = [str(i % args.properties) for i in range(args.stores)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'visual_baselines.json')
+        seed = VisualBaselineStore(path)
+        for store_id, property_id, phash in zip(store_ids[::2], property_ids[::2], hashes[::2]):
+            seed.add(store_id, property_id, phash)
+        seed.save()
+
+        def sweep():
+            # Read-only comparisons, so seeded NEW stores do not change later repeats
+            store = VisualBaselineStore(path)
+            return [store.compare_many([store_id], [property_id], [phash])[0]
+                    for store_id, property_id, phash in zip(store_ids, property_ids, hashes)]
+
+        def batch():
+            return VisualBaselineStore(path).compare_many(store_ids, property_ids, hashes)
+
+        sweep_time, sweep_results = best_of(args.repeat, sweep)
+        batch_time, batch_results = best_of(args.repeat, batch)
+
+    assert sweep_results == batch_results
+    passed = sum(1 for status, _ in batch_results if status == 'PASS')
+    print(f"{args.stores} stores, {len(seed.baselines)} baselines, {passed} within threshold")
+    print(f"per-store compare: {sweep_time * 1000:.1f} ms")
+    print(f"compare_many batch: {batch_time * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,10 @@
 import pytest
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.safari.service import Service as SafariService
-from webdriver_manager.chrome import ChromeDriverManager
 import platform
+import os
+import shutil
+
+# Selenium and webdriver_manager are imported inside create_driver so that
+# collection, filtering and --http-only runs never pay for them.
 
 # Move necessary constants here
 BROWSER_OPTIONS = {
@@ -18,6 +18,24 @@ BROWSER_OPTIONS = {
     }
 }
 
+# Executables (on PATH or default install locations) that mark a browser as available for --browser-matrix
+BROWSER_BINARIES = {
+    'chrome': [
+        'google-chrome',
+        'google-chrome-stable',
+        'chromium',
+        'chromium-browser',
+        'chrome',
+        r'C:\Program Files\Google\Chrome\Application\chrome.exe',
+        '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome'
+    ],
+    'firefox': [
+        'firefox',
+        r'C:\Program Files\Mozilla Firefox\firefox.exe',
+        '/Applications/Firefox.app/Contents/MacOS/firefox'
+    ]
+}
+
 TIMEOUTS = {
     'implicit': 10,
     'page_load': 30
@@ -26,19 +44,90 @@ TIMEOUTS = {
 def is_mac():
     return platform.system() == 'Darwin'
 
-@pytest.fixture(scope="session")
-def driver():
-    if is_mac():
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--http-only",
+        action="store_true",
+        default=False,
+        help="Only check that CreateTransaction returns a checkout URL; no browser is started"
+    )
+    parser.addoption(
+        "--network-checks",
+        action="store_true",
+        default=False,
+        help="Read store name, Google Pay and timer from CDP network responses (Chrome), DOM as fallback"
+    )
+    parser.addoption(
+        "--visual-check",
+        action="store_true",
+        default=False,
+        help="Compare a perceptual hash of the checkout card against stored baselines"
+    )
+    parser.addoption(
+        "--visual-baseline",
+        default=os.path.join('results', 'visual_baselines.json'),
+        help="Baseline file used by --visual-check"
+    )
+    parser.addoption(
+        "--update-visual-baselines",
+        action="store_true",
+        default=False,
+        help="With --visual-check, replace every compared store's baseline with the current card"
+    )
+    parser.addoption(
+        "--run-diff",
+        action="store_true",
+        default=False,
+        help="At the end of the run, diff the latest results files"
+    )
+    parser.addoption(
+        "--run-diff-runs",
+        type=int,
+        default=2,
+        metavar="RUNS",
+        help="Number of latest results files compared by --run-diff (default 2)"
+    )
+    parser.addoption(
+        "--browser-matrix",
+        default=None,
+        metavar="BROWSERS",
+        help="Comma-separated browsers (chrome,firefox,safari) validating one checkout transaction concurrently"
+    )
+
+
+def create_driver(browser, network_checks=False):
+    from selenium import webdriver
+
+    if browser == 'safari':
+        from selenium.webdriver.safari.service import Service as SafariService
+
         # Safari setup
         service = SafariService()
         driver = webdriver.Safari(service=service)
         driver.maximize_window()
+    elif browser == 'firefox':
+        from selenium.webdriver.firefox.options import Options as FirefoxOptions
+        from selenium.webdriver.firefox.service import Service as FirefoxService
+        from webdriver_manager.firefox import GeckoDriverManager
+
+        driver = webdriver.Firefox(
+            service=FirefoxService(GeckoDriverManager().install()),
+            options=FirefoxOptions()
+        )
     else:
         # Chrome setup with webdriver manager
+        from selenium.webdriver.chrome.options import Options as ChromeOptions
+        from selenium.webdriver.chrome.service import Service as ChromeService
+        from webdriver_manager.chrome import ChromeDriverManager
+
         options = ChromeOptions()
         for option in BROWSER_OPTIONS['chrome']['default']:
             options.add_argument(option)
         options.add_experimental_option('excludeSwitches', ['enable-logging'])
+        if network_checks:
+            # CDP network events are delivered through the performance log
+            options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
         driver = webdriver.Chrome(
             service=ChromeService(ChromeDriverManager().install()), 
             options=options
@@ -49,8 +138,55 @@ def driver():
     driver.set_page_load_timeout(TIMEOUTS['page_load'])
     driver.set_script_timeout(TIMEOUTS['page_load'])
     driver.maximize_window()
+    return driver
+
+
+def is_browser_available(browser):
+    if browser == 'safari':
+        return is_mac()
+    return any(shutil.which(binary) for binary in BROWSER_BINARIES.get(browser, []))
+
+
+@pytest.fixture(scope="session")
+def driver(pytestconfig):
+    driver = create_driver('safari' if is_mac() else 'chrome', pytestconfig.getoption("--network-checks"))
     yield driver
     
     driver.quit()
 
 
+@pytest.fixture(scope="session")
+def matrix_drivers(pytestconfig):
+    requested = [browser.strip().lower() for browser in pytestconfig.getoption("--browser-matrix").split(',') if browser.strip()]
+    browsers = [browser for browser in dict.fromkeys(requested) if is_browser_available(browser)]
+    skipped = [browser for browser in requested if browser not in browsers]
+    if skipped:
+        print(f"\nBrowsers not available locally, skipped: {', '.join(skipped)}")
+    if not browsers:
+        pytest.skip(f"None of the requested browsers are available: {', '.join(requested)}")
+
+    drivers = {}
+    try:
+        for browser in browsers:
+            drivers[browser] = create_driver(browser, pytestconfig.getoption("--network-checks"))
+        yield drivers
+    finally:
+        for driver in drivers.values():
+            driver.quit()
+
+
+@pytest.fixture(scope="session")
+def visual_baselines(pytestconfig):
+    if not pytestconfig.getoption("--visual-check"):
+        yield None
+        return
+
+    from src.utils.visual_regression import VisualBaselineStore
+
+    store = VisualBaselineStore(
+        pytestconfig.getoption("--visual-baseline"),
+        update=pytestconfig.getoption("--update-visual-baselines")
+    )
+    yield store
+
+    store.save()
@@ -6,6 +6,7 @@ class CommonLocators:
     GOOGLE_PAY_BUTTON = (By.CSS_SELECTOR, "div#googlePay")
     TIMER = (By.CSS_SELECTOR, "span#timerText")
     STORE_NAME = (By.CSS_SELECTOR, "h1.navbar-store")
+    CARD_FRAME = (By.CSS_SELECTOR, "iframe#hpc--card-frame")
 
 class SafariLocators:
     APPLE_PAY_BUTTON = (By.CSS_SELECTOR, "div#applePay")
@@ -23,26 +23,24 @@ class BasePage:
 
         try:
             from src.utils.constants import SCREENSHOTS_DIR
+            from src.utils.screenshot_store import ScreenshotStore
 
             timestamp = datetime.now().strftime('%H_%M')
 
             safe_store_id = str(store_id).replace('/', '_').replace('\\', '_')
             safe_item_name = "".join(c for c in str(item_name) if c.isalnum() or c in (' ', '-', '_')).strip()
 
-            filename = f"{safe_store_id}_{safe_item_name}_{timestamp}.png"
+            name = f"{safe_store_id}_{safe_item_name}_{timestamp}"
 
             if sub_folder:
                 directory = os.path.join(SCREENSHOTS_DIR, sub_folder)
-                os.makedirs(directory, exist_ok=True)
             else:
                 directory = SCREENSHOTS_DIR
 
-            filepath = os.path.join(directory, filename)
+            filepath = ScreenshotStore(directory).put(name, self.driver.get_screenshot_as_png())
 
             abs_filepath = os.path.abspath(filepath)
-
-            self.driver.save_screenshot(abs_filepath)
-            print(f"\nScreenshot saved: {abs_filepath}")
+            print(f"\nScreenshot saved: {name} -> {abs_filepath}")
             
         except Exception as e:
             print(f"Failed to take screenshot: {str(e)}")
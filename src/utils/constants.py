@@ -0,0 +1,4 @@
+import os
+
+RESULTS_DIR = "results"
+SCREENSHOTS_DIR = os.path.join(RESULTS_DIR, "screenshots")
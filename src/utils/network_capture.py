@@ -0,0 +1,174 @@
+import html
+import json
+import logging
+import re
+import time
+from typing import Dict, Optional
+
+
+class CheckoutNetworkCapture:
+    """Reads checkout facts from the page's own network responses.
+
+    Uses Chrome DevTools Protocol network events, delivered through the
+    driver's performance log, to inspect the initial document and any
+    XHR/Fetch JSON responses as they arrive. Collection ends when every
+    fact is known or the page's network goes idle, whichever is first;
+    facts still undecided are left as None so callers fall back to DOM checks.
+    The driver must be created with the 'goog:loggingPrefs' performance
+    capability (see the driver fixture in conftest.py).
+    """
+
+    RESOURCE_TYPES = ('Document', 'XHR', 'Fetch')
+    FACTS = ('store_name', 'googlepay_present', 'timer_value')
+
+    # Only checkout-specific keys: generic ones such as Google Pay's merchantInfo.merchantName
+    # or a payment method's displayName are not the store name. TimeoutMinutes is left out
+    # because it echoes the value sent in CreateTransaction rather than what the page shows.
+    STORE_NAME_KEYS = ('storename', 'dbaname')
+    GOOGLE_PAY_KEYS = ('googlepay', 'googlepayenabled', 'isgooglepayenabled', 'allowgooglepay')
+    TIMER_SECOND_KEYS = ('remainingseconds', 'timerseconds')
+
+    STORE_NAME_HTML = re.compile(r'<h1[^>]*class="[^"]*\bnavbar-store\b[^"]*"[^>]*>(.*?)</h1>', re.S | re.I)
+    GOOGLE_PAY_HTML = re.compile(r'<div[^>]*\bid="googlePay"', re.I)
+    TIMER_HTML = re.compile(r'<span[^>]*\bid="timerText"[^>]*>\s*(\d{1,2}:\d{2})', re.I)
+    TAGS = re.compile(r'<[^>]+>')
+
+    def __init__(self, driver, max_wait: float = 10, poll_interval: float = 0.1):
+        self.driver = driver
+        self.max_wait = max_wait
+        self.poll_interval = poll_interval
+        self.facts: Dict[str, Optional[object]] = dict.fromkeys(self.FACTS)
+        self._pending = {}
+        self._in_flight = set()
+        self._document_loaded = False
+
+    @staticmethod
+    def is_supported(driver) -> bool:
+        return hasattr(driver, 'execute_cdp_cmd')
+
+    def start(self):
+        """Enable network events and drop anything logged by earlier pages."""
+        self.driver.execute_cdp_cmd('Network.enable', {})
+        self.driver.get_log('performance')
+        self.facts = dict.fromkeys(self.FACTS)
+        self._pending = {}
+        self._in_flight = set()
+        self._document_loaded = False
+
+    def is_complete(self) -> bool:
+        return all(value is not None for value in self.facts.values())
+
+    def is_idle(self) -> bool:
+        return self._document_loaded and not self._in_flight
+
+    def collect(self) -> Dict[str, Optional[object]]:
+        """Consume network events until every fact is known or the network is idle.
+
+        max_wait only guards against requests that never finish (long polling,
+        sockets); a normal page ends on idle well before it.
+        """
+        deadline = time.monotonic() + self.max_wait
+        while True:
+            for entry in self.driver.get_log('performance'):
+                self._handle_event(entry)
+                if self.is_complete():
+                    logging.info(f"All checkout facts captured from network: {self.facts}")
+                    return dict(self.facts)
+
+            if self.is_idle():
+                logging.info(f"Network idle, partial facts: {self.facts}")
+                return dict(self.facts)
+            if time.monotonic() >= deadline:
+                logging.info(f"Network capture gave up with {len(self._in_flight)} requests in flight, "
+                             f"partial facts: {self.facts}")
+                return dict(self.facts)
+            time.sleep(self.poll_interval)
+
+    def _handle_event(self, entry):
+        try:
+            message = json.loads(entry['message'])['message']
+        except (KeyError, TypeError, ValueError):
+            return
+
+        method = message.get('method')
+        params = message.get('params', {})
+
+        request_id = params.get('requestId')
+
+        if method == 'Network.requestWillBeSent':
+            self._in_flight.add(request_id)
+        elif method == 'Network.responseReceived' and params.get('type') in self.RESOURCE_TYPES:
+            self._pending[request_id] = (params['type'], params['response'].get('mimeType', ''))
+        elif method == 'Network.loadingFinished':
+            self._in_flight.discard(request_id)
+            if request_id in self._pending:
+                resource_type, mime_type = self._pending.pop(request_id)
+                if resource_type == 'Document':
+                    self._document_loaded = True
+                body = self._get_body(request_id)
+                if body:
+                    self._parse_body(body, mime_type)
+        elif method == 'Network.loadingFailed':
+            self._in_flight.discard(request_id)
+            self._pending.pop(request_id, None)
+        elif method == 'Page.loadEventFired':
+            self._document_loaded = True
+
+    def _get_body(self, request_id: str) -> Optional[str]:
+        try:
+            response = self.driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+        except Exception as e:
+            logging.info(f"Could not read response body {request_id}: {str(e)}")
+            return None
+
+        if response.get('base64Encoded'):
+            return None
+        return response.get('body')
+
+    def _parse_body(self, body: str, mime_type: str):
+        if 'json' in mime_type:
+            try:
+                self._parse_json(json.loads(body))
+            except ValueError:
+                return
+        elif 'html' in mime_type:
+            self._parse_html(body)
+
+    def _parse_json(self, node):
+        if isinstance(node, list):
+            for item in node:
+                self._parse_json(item)
+            return
+        if not isinstance(node, dict):
+            return
+
+        for key, value in node.items():
+            normalized = key.lower().replace('_', '')
+            if isinstance(value, (dict, list)):
+                self._parse_json(value)
+            elif normalized in self.STORE_NAME_KEYS and isinstance(value, str) and value.strip():
+                self._set('store_name', value.strip())
+            elif normalized in self.GOOGLE_PAY_KEYS and isinstance(value, bool):
+                self._set('googlepay_present', value)
+            elif normalized in self.TIMER_SECOND_KEYS and isinstance(value, (int, float)):
+                minutes, seconds = divmod(int(value), 60)
+                self._set('timer_value', f"{minutes:02d}:{seconds:02d}")
+
+    def _parse_html(self, body: str):
+        match = self.STORE_NAME_HTML.search(body)
+        if match:
+            name = html.unescape(self.TAGS.sub('', match.group(1))).strip()
+            if name:
+                self._set('store_name', name)
+
+        # The button may be injected later by script, so absence decides nothing.
+        if self.GOOGLE_PAY_HTML.search(body):
+            self._set('googlepay_present', True)
+
+        match = self.TIMER_HTML.search(body)
+        if match:
+            self._set('timer_value', match.group(1))
+
+    def _set(self, fact: str, value):
+        if self.facts[fact] is None:
+            self.facts[fact] = value
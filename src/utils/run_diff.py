@@ -0,0 +1,136 @@
+"""Run-to-run diff of test_results_<date>.csv files.
+
+Every run is loaded into one index keyed on (Store ID, Terminal ID) in a
+single pass per file, then each check column is classified per store:
+
+- newly failing: FAIL in the latest run, PASS the last time it was tested before
+- newly fixed:   PASS in the latest run, FAIL the last time it was tested before
+- flapping:      changed status more than once across the runs given
+
+Runs are compared in the order given; by default the latest results files.
+
+    python -m src.utils.run_diff                       # latest two runs
+    python -m src.utils.run_diff --runs 5              # latest five runs
+    python -m src.utils.run_diff old.csv new.csv
+"""
+import argparse
+import csv
+import glob
+import os
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.utils.constants import RESULTS_DIR
+
+CHECK_COLUMNS = ('Timer', 'GooglePay', 'DB Name Match', 'Postal Code')
+CATEGORIES = ('newly failing', 'newly fixed', 'flapping')
+
+StoreKey = Tuple[str, str]
+
+
+def find_result_files(results_dir: str = RESULTS_DIR, runs: int = 2) -> List[str]:
+    # ISO dates in the file names sort chronologically
+    return sorted(glob.glob(os.path.join(results_dir, 'test_results_*.csv')))[-runs:]
+
+
+def load_runs(paths: Sequence[str]) -> Dict[StoreKey, Dict]:
+    """Index every run by (Store ID, Terminal ID); the last row of a store within a run wins."""
+    index = {}
+    for run, path in enumerate(paths):
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                key = (row['Store ID'], row['Terminal ID'])
+                entry = index.get(key)
+                if entry is None:
+                    entry = {
+                        'property_id': row.get('Property ID', ''),
+                        'statuses': {column: [None] * len(paths) for column in CHECK_COLUMNS}
+                    }
+                    index[key] = entry
+                for column in CHECK_COLUMNS:
+                    status = row.get(column)
+                    if status in ('PASS', 'FAIL'):
+                        entry['statuses'][column][run] = status
+    return index
+
+
+def classify(statuses: Sequence[Optional[str]]) -> Optional[str]:
+    observed = [status for status in statuses if status is not None]
+    if len(observed) < 2:
+        return None
+
+    changes = sum(1 for previous, current in zip(observed, observed[1:]) if previous != current)
+    if changes > 1:
+        return 'flapping'
+
+    # A store the latest run did not test has neither newly failed nor been fixed
+    if statuses[-1] is None:
+        return None
+    if observed[-2] == 'PASS' and observed[-1] == 'FAIL':
+        return 'newly failing'
+    if observed[-2] == 'FAIL' and observed[-1] == 'PASS':
+        return 'newly fixed'
+    return None
+
+
+def diff_runs(paths: Sequence[str]) -> Dict[str, Dict[str, List[Tuple[str, str, str]]]]:
+    """Return {property_id: {category: [(store_id, terminal_id, column), ...]}}."""
+    report = {}
+    for (store_id, terminal_id), entry in load_runs(paths).items():
+        for column, statuses in entry['statuses'].items():
+            category = classify(statuses)
+            if category:
+                by_category = report.setdefault(entry['property_id'], {name: [] for name in CATEGORIES})
+                by_category[category].append((store_id, terminal_id, column))
+    return report
+
+
+def format_report(paths: Sequence[str], report: Dict[str, Dict[str, List[Tuple[str, str, str]]]]) -> str:
+    lines = ["=" * 50, "RUN DIFF", "=" * 50]
+    lines.extend(f"Run {run + 1}: {os.path.basename(path)}" for run, path in enumerate(paths))
+
+    totals = {name: sum(len(groups[name]) for groups in report.values()) for name in CATEGORIES}
+    lines.append(", ".join(f"{name.capitalize()}: {count}" for name, count in totals.items()))
+
+    for property_id in sorted(report, key=lambda value: (len(value), value)):
+        lines.append("")
+        lines.append(f"Property {property_id}:")
+        for name in CATEGORIES:
+            for store_id, terminal_id, column in sorted(report[property_id][name]):
+                lines.append(f"  {name.upper():<14} {column:<14} Store {store_id} / Terminal {terminal_id}")
+
+    lines.append("=" * 50)
+    return "\n".join(lines) + "\n"
+
+
+def write_run_diff(paths: Optional[Sequence[str]] = None, runs: int = 2,
+                   results_dir: str = RESULTS_DIR) -> Optional[str]:
+    """Diff the given (or latest) runs, save the report next to the results and return its text."""
+    paths = list(paths) if paths else find_result_files(results_dir, runs)
+    if len(paths) < 2:
+        return None
+
+    text = format_report(paths, diff_runs(paths))
+
+    os.makedirs(results_dir, exist_ok=True)
+    timestamp = datetime.now().strftime('%Y-%m-%d')
+    with open(os.path.join(results_dir, f"run_diff_{timestamp}.txt"), 'w', encoding='utf-8') as f:
+        f.write(text)
+    return text
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report newly failing, fixed and flapping stores between runs")
+    parser.add_argument('files', nargs='*', help='Results CSV files, oldest first (default: latest in results dir)')
+    parser.add_argument('--runs', type=int, default=2, help='Number of latest runs to compare when no files are given')
+    parser.add_argument('--results-dir', default=RESULTS_DIR, help='Directory holding test_results_<date>.csv files')
+    args = parser.parse_args()
+
+    text = write_run_diff(args.files, args.runs, args.results_dir)
+    if text is None:
+        parser.exit(1, "Need at least two result files to diff\n")
+    print(text, end='')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,254 @@
+"""Content-addressed screenshot storage.
+
+Images are written once under objects/<2 hex>/<sha256>.png and referenced by
+name (e.g. TP_<store>_<terminal>) through an append-only refs.tsv file, so
+identical error pages cost one file no matter how many stores hit them.
+Writers and compaction serialize on a lock file so runs sharing the
+directory never lose each other's screenshots.
+
+    python -m src.utils.screenshot_store compact --max-age-days 14 --max-size-mb 500
+    python -m src.utils.screenshot_store path TP_16149131009_26201237009
+"""
+import argparse
+import hashlib
+import logging
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from src.utils.constants import SCREENSHOTS_DIR
+
+REFS_FILE = 'refs.tsv'
+OBJECTS_DIR = 'objects'
+LOCK_FILE = '.lock'
+LOCK_TIMEOUT = 120
+# A lock not refreshed for this long is left over from a killed process
+STALE_LOCK_SECONDS = 600
+
+
+class ScreenshotStore:
+    def __init__(self, root: str = SCREENSHOTS_DIR):
+        self.root = root
+        self.refs_path = os.path.join(root, REFS_FILE)
+        self.objects_dir = os.path.join(root, OBJECTS_DIR)
+        self.lock_path = os.path.join(root, LOCK_FILE)
+        self._lock_token = None
+
+    @contextmanager
+    def locked(self, timeout: float = LOCK_TIMEOUT):
+        """Hold the store's lock file; os.O_EXCL keeps this portable across runners.
+
+        The file holds a token unique to this holder, so releasing never removes
+        a lock that another runner took over after judging this one stale.
+        """
+        os.makedirs(self.root, exist_ok=True)
+        token = f"{os.getpid()}:{uuid.uuid4().hex}"
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                fd = os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(self.lock_path) > STALE_LOCK_SECONDS:
+                        logging.warning(f"Removing stale screenshot store lock {self.lock_path}")
+                        os.remove(self.lock_path)
+                        continue
+                except FileNotFoundError:
+                    continue
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"Timed out waiting for screenshot store lock {self.lock_path}")
+                time.sleep(0.05)
+
+        try:
+            os.write(fd, token.encode())
+        finally:
+            os.close(fd)
+
+        self._lock_token = token
+        try:
+            yield
+        finally:
+            self._lock_token = None
+            self._release_lock(token)
+
+    def _release_lock(self, token: str):
+        try:
+            with open(self.lock_path, 'r', encoding='utf-8') as f:
+                holder = f.read()
+            if holder == token:
+                os.remove(self.lock_path)
+            else:
+                logging.warning(f"Screenshot store lock {self.lock_path} was taken over by {holder}")
+        except FileNotFoundError:
+            logging.warning(f"Screenshot store lock {self.lock_path} was removed while held")
+
+    def _refresh_lock(self):
+        """Touch the held lock so a long compaction is not mistaken for a stale one."""
+        if self._lock_token is None:
+            return
+        try:
+            os.utime(self.lock_path)
+        except FileNotFoundError:
+            pass
+
+    def object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], f"{digest}.png")
+
+    def put(self, name: str, png_bytes: bytes) -> str:
+        """Store an image under a name and return the path of its object file."""
+        digest = hashlib.sha256(png_bytes).hexdigest()
+        path = self.object_path(digest)
+
+        with self.locked():
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                temp_path = f"{path}.{os.getpid()}.tmp"
+                with open(temp_path, 'wb') as f:
+                    f.write(png_bytes)
+                os.replace(temp_path, path)
+            else:
+                logging.info(f"Screenshot {name} is identical to stored object {digest}")
+
+            with open(self.refs_path, 'a', encoding='utf-8') as f:
+                f.write(f"{time.time():.0f}\t{name}\t{digest}\n")
+        return path
+
+    def read_refs(self) -> Dict[str, Tuple[float, str]]:
+        """Latest (timestamp, digest) for every name."""
+        refs = {}
+        if not os.path.exists(self.refs_path):
+            return refs
+
+        with open(self.refs_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                parts = line.rstrip('\n').split('\t')
+                if len(parts) == 3:
+                    refs[parts[1]] = (float(parts[0]), parts[2])
+        return refs
+
+    def resolve(self, name: str) -> Optional[str]:
+        ref = self.read_refs().get(name)
+        return self.object_path(ref[1]) if ref else None
+
+    def compact(self, max_age_days: Optional[float] = None, max_size_mb: Optional[float] = None) -> Dict[str, int]:
+        """Prune references by age, then the least recently used until objects fit in max_size_mb.
+
+        Objects that are no longer referenced are deleted, as are loose PNGs
+        left in the root by older runs once they exceed the age limit.
+        Runs under the store lock so concurrent put() calls wait for it.
+        """
+        with self.locked():
+            return self._compact(max_age_days, max_size_mb)
+
+    def _compact(self, max_age_days: Optional[float], max_size_mb: Optional[float]) -> Dict[str, int]:
+        now = time.time()
+        refs = self.read_refs()
+        removed_refs = 0
+        removed_loose = 0
+
+        if max_age_days is not None:
+            cutoff = now - max_age_days * 86400
+            for name in [name for name, (saved, _) in refs.items() if saved < cutoff]:
+                del refs[name]
+                removed_refs += 1
+
+            if os.path.isdir(self.root):
+                for entry in os.scandir(self.root):
+                    if entry.is_file() and entry.name.endswith('.png') and entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+                        removed_loose += 1
+                        if removed_loose % 500 == 0:
+                            self._refresh_lock()
+
+        objects = {}
+        if os.path.isdir(self.objects_dir):
+            for bucket in os.scandir(self.objects_dir):
+                if bucket.is_dir():
+                    for entry in os.scandir(bucket.path):
+                        if entry.name.endswith('.png'):
+                            objects[entry.name[:-4]] = entry.stat().st_size
+                    self._refresh_lock()
+
+        # Newest reference per object decides when it is evicted
+        last_used = {}
+        for saved, digest in refs.values():
+            last_used[digest] = max(saved, last_used.get(digest, 0))
+
+        if max_size_mb is not None:
+            budget = max_size_mb * 1024 * 1024
+            total = sum(objects.get(digest, 0) for digest in last_used)
+            evicted = set()
+            # Least recently used first; on equal times the largest goes first so
+            # fewer screenshots are lost, then by digest for a stable order
+            for digest in sorted(last_used, key=lambda d: (last_used[d], -objects.get(d, 0), d)):
+                if total <= budget:
+                    break
+                total -= objects.get(digest, 0)
+                evicted.add(digest)
+
+            for name in [name for name, (_, digest) in refs.items() if digest in evicted]:
+                del refs[name]
+                removed_refs += 1
+            for digest in evicted:
+                del last_used[digest]
+
+        removed_objects = 0
+        for digest in objects:
+            if digest not in last_used:
+                os.remove(self.object_path(digest))
+                removed_objects += 1
+                if removed_objects % 500 == 0:
+                    self._refresh_lock()
+
+        self._write_refs(refs)
+
+        return {
+            'refs_removed': removed_refs,
+            'objects_removed': removed_objects,
+            'loose_removed': removed_loose,
+            'refs_kept': len(refs),
+            'objects_kept': len(last_used)
+        }
+
+    def _write_refs(self, refs: Dict[str, Tuple[float, str]]):
+        if not refs and not os.path.exists(self.refs_path):
+            return
+        temp_path = f"{self.refs_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            for name, (saved, digest) in sorted(refs.items(), key=lambda item: item[1][0]):
+                f.write(f"{saved:.0f}\t{name}\t{digest}\n")
+        os.replace(temp_path, self.refs_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the content-addressed screenshot store")
+    parser.add_argument('--root', default=SCREENSHOTS_DIR, help='Screenshot store directory')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    compact = commands.add_parser('compact', help='Prune screenshots by age and total size')
+    compact.add_argument('--max-age-days', type=float, help='Drop screenshots older than this')
+    compact.add_argument('--max-size-mb', type=float, help='Evict the oldest screenshots above this total size')
+
+    path = commands.add_parser('path', help='Print the file a screenshot name refers to')
+    path.add_argument('name')
+
+    args = parser.parse_args()
+    store = ScreenshotStore(args.root)
+
+    if args.command == 'compact':
+        stats = store.compact(args.max_age_days, args.max_size_mb)
+        print(f"{datetime.now():%Y-%m-%d %H:%M} compacted {args.root}: " +
+              ", ".join(f"{key.replace('_', ' ')}: {value}" for key, value in stats.items()))
+    else:
+        resolved = store.resolve(args.name)
+        if not resolved:
+            parser.exit(1, f"No screenshot named {args.name}\n")
+        print(resolved)
+
+
+if __name__ == '__main__':
+    main()
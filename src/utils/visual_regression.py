@@ -0,0 +1,184 @@
+import io
+import json
+import logging
+import os
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+HASH_SIZE = 8
+SAMPLE_SIZE = 32
+DEFAULT_THRESHOLD = 10
+
+# Number of set bits for every byte value, used to popcount XOR-ed hashes
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def _dct_matrix(size: int) -> np.ndarray:
+    k = np.arange(size)
+    matrix = np.cos(np.pi * (2 * k[None, :] + 1) * k[:, None] / (2 * size)) * np.sqrt(2 / size)
+    matrix[0] /= np.sqrt(2)
+    return matrix
+
+
+_DCT = _dct_matrix(SAMPLE_SIZE)
+
+
+def perceptual_hash(png_bytes: bytes) -> int:
+    """64-bit DCT perceptual hash of a PNG image."""
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(png_bytes)).convert('L').resize((SAMPLE_SIZE, SAMPLE_SIZE), Image.LANCZOS)
+    pixels = np.asarray(image, dtype=np.float64)
+    low_frequencies = (_DCT @ pixels @ _DCT.T)[:HASH_SIZE, :HASH_SIZE]
+    bits = low_frequencies > np.median(low_frequencies)
+    return int.from_bytes(np.packbits(bits.ravel()).tobytes(), 'big')
+
+
+def hamming_distances(hashes: np.ndarray, baselines: np.ndarray) -> np.ndarray:
+    """Bit distance between every hash and every baseline, shape (len(hashes), len(baselines))."""
+    xor = np.bitwise_xor(hashes[:, None], baselines[None, :])
+    return _POPCOUNT[xor.view(np.uint8)].reshape(*xor.shape, 8).sum(axis=2, dtype=np.uint16)
+
+
+class VisualBaselineStore:
+    """Per-store perceptual hash baselines of the checkout card.
+
+    A store is compared with its own baseline when it has one, otherwise
+    with the closest baseline of any store in the same property. Stores
+    with nothing to compare against are recorded as new baselines. With
+    update=True every compared store's baseline is replaced, for re-baselining
+    after an intended UI change. A sweep calls compare() once per store, which
+is vectorized over that store's property baselines; compare_many() batches
+any number of stores at once.
+    """
+
+    def __init__(self, path: str, threshold: int = DEFAULT_THRESHOLD, update: bool = False):
+        self.path = path
+        self.threshold = threshold
+        self.update = update
+        self.baselines: Dict[str, Dict[str, str]] = {}
+        self._index = None
+        self._dirty = False
+        self._lock = threading.RLock()
+
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.baselines = json.load(f)
+
+    def _build_index(self):
+        store_hashes = {}
+        positions = {}
+        by_property: Dict[str, List[int]] = {}
+        for store_id, entry in self.baselines.items():
+            phash = int(entry['hash'], 16)
+            store_hashes[store_id] = phash
+            hashes = by_property.setdefault(entry['property_id'], [])
+            positions[store_id] = len(hashes)
+            hashes.append(phash)
+
+        self._index = (
+            store_hashes,
+            {property_id: np.array(hashes, dtype=np.uint64) for property_id, hashes in by_property.items()},
+            positions
+        )
+
+    def compare_many(self, store_ids: Sequence[str], property_ids: Sequence[str],
+                     hashes: Sequence[int]) -> List[Tuple[str, Optional[int]]]:
+        """Return (status, distance) per store; status is PASS, FAIL or NEW."""
+        if self._index is None:
+            self._build_index()
+        store_hashes, property_hashes, _ = self._index
+
+        hashes = np.array(hashes, dtype=np.uint64)
+        distances = np.full(len(hashes), -1, dtype=np.int32)
+
+        own = np.array([store_id in store_hashes for store_id in store_ids], dtype=bool)
+        if own.any():
+            own_baselines = np.array([store_hashes[store_id] for store_id, has in zip(store_ids, own) if has],
+                                     dtype=np.uint64)
+            xor = np.bitwise_xor(hashes[own], own_baselines)
+            distances[own] = _POPCOUNT[xor.view(np.uint8)].reshape(-1, 8).sum(axis=1)
+
+        groups: Dict[str, List[int]] = {}
+        for position in np.flatnonzero(~own):
+            property_id = property_ids[position]
+            if property_id in property_hashes:
+                groups.setdefault(property_id, []).append(position)
+
+        for property_id, positions in groups.items():
+            distances[positions] = hamming_distances(hashes[positions], property_hashes[property_id]).min(axis=1)
+
+        results = []
+        for distance in distances:
+            if distance < 0:
+                results.append(('NEW', None))
+            else:
+                results.append(('PASS' if distance <= self.threshold else 'FAIL', int(distance)))
+        return results
+
+    def compare(self, store_id: str, property_id: str, phash: int) -> Tuple[str, Optional[int]]:
+        """Compare one store and record a baseline for it if it had none and did not fail.
+
+        In update mode the baseline is always replaced and a FAIL is reported as UPDATED.
+        """
+        with self._lock:
+            status, distance = self.compare_many([store_id], [property_id], [phash])[0]
+            if self.update:
+                self.add(store_id, property_id, phash)
+                if status == 'FAIL':
+                    status = 'UPDATED'
+            elif store_id not in self.baselines and status != 'FAIL':
+                self.add(store_id, property_id, phash)
+        return status, distance
+
+    def for_variant(self, variant: str) -> 'BaselineVariant':
+        return BaselineVariant(self, variant)
+
+    def add(self, store_id: str, property_id: str, phash: int):
+        previous = self.baselines.get(store_id)
+        self.baselines[store_id] = {'property_id': property_id, 'hash': f"{phash:016x}"}
+        self._dirty = True
+
+        if self._index is None:
+            return
+        store_hashes, property_hashes, positions = self._index
+        store_hashes[store_id] = phash
+
+        if previous is None:
+            hashes = property_hashes.get(property_id, np.empty(0, dtype=np.uint64))
+            positions[store_id] = len(hashes)
+            property_hashes[property_id] = np.append(hashes, np.uint64(phash))
+        elif previous['property_id'] == property_id:
+            # Re-baselining replaces the entry in place, keeping update runs linear
+            property_hashes[property_id][positions[store_id]] = np.uint64(phash)
+        else:
+            # A store moving to another property is rare enough to rebuild for
+            self._index = None
+
+    def save(self):
+        with self._lock:
+            self._save()
+
+    def _save(self):
+        if not self._dirty:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(self.baselines, f, indent=2, sort_keys=True)
+        self._dirty = False
+        logging.info(f"Saved {len(self.baselines)} visual baselines to {self.path}")
+
+
+class BaselineVariant:
+    """Baselines of one rendering variant (e.g. a browser), kept apart by suffixing store and property keys."""
+
+    def __init__(self, store: VisualBaselineStore, variant: str):
+        self.store = store
+        self.variant = variant
+
+    def compare(self, store_id: str, property_id: str, phash: int) -> Tuple[str, Optional[int]]:
+        return self.store.compare(f"{store_id}@{self.variant}", f"{property_id}@{self.variant}", phash)
@@ -1,17 +1,20 @@
 import pytest
-import requests
 import csv
 import uuid
 import os
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Dict, Tuple
-from src.pages.base_page import BasePage
-from src.locators.store_locators import CommonLocators, SafariLocators
-from selenium.webdriver.common.by import By
 from conftest import is_mac
 
+# requests, selenium and the page objects are imported where they are used so
+# that collecting the parametrized stores stays cheap.
 
-def read_store_data(csv_path: str) -> List[Tuple[str, str, str, str, str, str, str, str]]:
+
+@lru_cache(maxsize=None)
+def read_store_data(csv_path: str) -> Tuple[Tuple[str, str, str, str, str, str, str, str], ...]:
     store_data = []
     with open(csv_path, 'r', encoding='utf-8') as file:
         csv_reader = csv.reader(file)
@@ -28,11 +31,6 @@ def read_store_data(csv_path: str) -> List[Tuple[str, str, str, str, str, str, s
                     revenue_center_name = row[6].strip()
                     dba_name = row[7].strip()
 
-                    print(f"\nValidating store data:")
-                    print(f"Batch: {batch}")
-                    print(f"Store ID: {store_id} (original: {row[1]})")
-                    print(f"Terminal ID: {terminal_id} (original: {row[2]})")
-
                     store_data.append((
                         store_id,
                         terminal_id,
@@ -44,17 +42,19 @@ def read_store_data(csv_path: str) -> List[Tuple[str, str, str, str, str, str, s
                         batch
                     ))
             except Exception as e:
-                print(f"Error processing row: {row}")
-                print(f"Error: {str(e)}")
+                logging.warning(f"Skipping invalid store row {row}: {str(e)}")
                 continue
 
     if not store_data:
         raise ValueError("No valid data found in stores.csv")
 
-    return store_data
+    # Cached and shared by every caller, so hand out an immutable copy
+    return tuple(store_data)
 
 
 def create_freedom_pay_transaction(store_id: str, terminal_id: str) -> Dict:
+    import requests
+
     url = "https://payments.freedompay.com/checkoutservice/checkoutservice.svc/CreateTransaction"
 
     headers = {
@@ -126,6 +126,9 @@ def write_failure_to_file(store_id: str, terminal_id: str, dba_name: str, proper
         elif "Invalid URL format" in failure_message:
             f.write("Type: Invalid URL\n")
             f.write(f"Details: {failure_message}\n")
+        elif "Visual mismatch" in failure_message:
+            f.write("Type: Visual Regression\n")
+            f.write(f"Details: {failure_message}\n")
         else:
             f.write(f"Type: Element Not Found\n")
             f.write(f"Details: {failure_message}\n")
@@ -134,23 +137,19 @@ def write_failure_to_file(store_id: str, terminal_id: str, dba_name: str, proper
 
 
 def take_screenshot(driver, store_id: str, filename: str):
-    results_dir = "results"
-    screenshots_dir = os.path.join(results_dir, "screenshots")
-    if not os.path.exists(screenshots_dir):
-        os.makedirs(screenshots_dir)
+    from src.utils.screenshot_store import ScreenshotStore
 
     if filename.strip():
         safe_filename = "".join(c for c in filename if c.isalnum() or c in (' ', '-', '_')).strip()
     else:
         safe_filename = f"store_{store_id}"
 
-    filepath = os.path.join(screenshots_dir, f"{safe_filename}.png")
-    driver.save_screenshot(filepath)
-    print(f"\nScreenshot saved: {filepath}")
+    filepath = ScreenshotStore().put(safe_filename, driver.get_screenshot_as_png())
+    print(f"\nScreenshot saved: {safe_filename} -> {filepath}")
 
 
 def write_timer_to_file(store_id: str, terminal_id: str, dba_name: str, property_id: str, revenue_center_id: str,
-                        timer_value: str):
+                        timer_value: str, browser: str = None):
     results_dir = "results"
     if not os.path.exists(results_dir):
         os.makedirs(results_dir)
@@ -173,94 +172,310 @@ def write_timer_to_file(store_id: str, terminal_id: str, dba_name: str, property
         else:
             f.write("DBA Name: <empty>\n")
 
-        f.write(f"\nTIMER VALUE AT START: {timer_value}")
+        tag = f"[{browser}] " if browser else ""
+        f.write(f"\n{tag}TIMER VALUE AT START: {timer_value}")
         if timer_status != "PASS":
             f.write(" (FAIL)")
         f.write("\n")
         f.write("=" * 50 + "\n\n")
 
 
-def write_results_to_csv(store_id: str, terminal_id: str, property_id: str, revenue_center_id: str,
-                         location_name: str, revenue_center_name: str, dba_name: str,
-                         results: Dict[str, bool], timer_value: str, batch: str, failures: list = None):
-    results_dir = "results"
-    if not os.path.exists(results_dir):
-        os.makedirs(results_dir)
-
-    timestamp = datetime.now().strftime('%Y-%m-%d')
-    filepath = os.path.join(results_dir, f"test_results_{timestamp}.csv")
+STORE_COLUMNS = [
+    'Batch',
+    'Store ID',
+    'Terminal ID',
+    'Property ID',
+    'RVC ID',
+    'Location Name',
+    'RVC Name',
+    'DBA Name'
+]
+
+CHECK_COLUMNS = [
+    'Timer',
+    'Timer at Launch',
+    'GooglePay',
+    'ApplePay',
+    'DB Name Match',
+    'Postal Code',
+    'Visual'
+]
+
+
+def format_dba_name(dba_name: str) -> str:
+    if not dba_name or dba_name.strip() == "" or dba_name.strip() == "N/A":
+        return "N/A"
+    return dba_name
 
-    headers = [
-        'Batch',
-        'Store ID',
-        'Terminal ID',
-        'Property ID',
-        'RVC ID',
-        'Location Name',
-        'RVC Name',
-        'DBA Name',
-        'Timer',
-        'Timer at Launch',
-        'GooglePay',
-        'ApplePay',
-        'DB Name Match',
-        'Postal Code'
-    ]
-
-    if not os.path.exists(filepath):
-        with open(filepath, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(headers)
 
+def format_check_values(results: Dict[str, bool], timer_value: str, dba_name: str,
+                        visual_status: str = 'N/A', applepay_checked: bool = True) -> List[str]:
     # Determine DB Name status
-    if not dba_name or dba_name.strip() == "" or dba_name.strip() == "N/A":
-        dba_name_value = "N/A"
+    if format_dba_name(dba_name) == "N/A":
         db_name_status = "N/A"
     else:
-        dba_name_value = dba_name
         db_name_status = "PASS" if results.get('store_name_match', False) else "FAIL"
 
     # Special handling for invalid URL cases
     if "Invalid URL" in timer_value:
-        row = [
-            batch,
-            store_id,
-            terminal_id,
-            property_id,
-            revenue_center_id,
-            location_name,
-            revenue_center_name,
-            dba_name_value,
+        return [
             'FAIL',
             timer_value,
             'N/A',
             'N/A',
             db_name_status,
+            'N/A',
             'N/A'
         ]
+
+    if not applepay_checked:
+        applepay_status = 'N/A'
     else:
-        row = [
-            batch,
-            store_id,
-            terminal_id,
-            property_id,
-            revenue_center_id,
-            location_name,
-            revenue_center_name,
-            dba_name_value,
-            'PASS' if results.get('timer_present', False) else 'FAIL',
-            timer_value,
-            'PASS' if results.get('googlepay_present', False) else 'FAIL',
-            'PASS' if results.get('applepay_present', False) else 'FAIL',
-            db_name_status,
-            'PASS' if results.get('postal_code_present', False) else 'FAIL'
-        ]
+        applepay_status = 'PASS' if results.get('applepay_present', False) else 'FAIL'
+
+    return [
+        'PASS' if results.get('timer_present', False) else 'FAIL',
+        timer_value,
+        'PASS' if results.get('googlepay_present', False) else 'FAIL',
+        applepay_status,
+        db_name_status,
+        'PASS' if results.get('postal_code_present', False) else 'FAIL',
+        visual_status
+    ]
+
+
+def write_results_to_csv(store_id: str, terminal_id: str, property_id: str, revenue_center_id: str,
+                         location_name: str, revenue_center_name: str, dba_name: str,
+                         results: Dict[str, bool], timer_value: str, batch: str, failures: list = None,
+                         visual_status: str = 'N/A'):
+    results_dir = "results"
+    if not os.path.exists(results_dir):
+        os.makedirs(results_dir)
+
+    timestamp = datetime.now().strftime('%Y-%m-%d')
+    filepath = os.path.join(results_dir, f"test_results_{timestamp}.csv")
+
+    if not os.path.exists(filepath):
+        with open(filepath, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(STORE_COLUMNS + CHECK_COLUMNS)
+
+    row = [
+        batch,
+        store_id,
+        terminal_id,
+        property_id,
+        revenue_center_id,
+        location_name,
+        revenue_center_name,
+        format_dba_name(dba_name)
+    ] + format_check_values(results, timer_value, dba_name, visual_status)
+
+    with open(filepath, 'a', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(row)
+
+
+def write_matrix_results_to_csv(store_id: str, terminal_id: str, property_id: str, revenue_center_id: str,
+                                location_name: str, revenue_center_name: str, dba_name: str, batch: str,
+                                browsers: List[str], browser_results: Dict[str, Tuple[Dict[str, bool], str, str]]):
+    """One row per store with a '<check> [<browser>]' column for every browser in the matrix.
+
+    The browser set is part of the file name, so runs with a different matrix
+    on the same day never append rows under another run's columns.
+    """
+    results_dir = "results"
+    if not os.path.exists(results_dir):
+        os.makedirs(results_dir)
+
+    timestamp = datetime.now().strftime('%Y-%m-%d')
+    filepath = os.path.join(results_dir, f"matrix_results_{timestamp}_{'-'.join(browsers)}.csv")
+
+    if not os.path.exists(filepath):
+        with open(filepath, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(STORE_COLUMNS + [f"{column} [{browser}]" for browser in browsers
+                                             for column in CHECK_COLUMNS])
+
+    row = [
+        batch,
+        store_id,
+        terminal_id,
+        property_id,
+        revenue_center_id,
+        location_name,
+        revenue_center_name,
+        format_dba_name(dba_name)
+    ]
+    for browser in browsers:
+        results, timer_value, visual_status = browser_results[browser]
+        # Apple Pay is only checked in Safari
+        row += format_check_values(results, timer_value, dba_name, visual_status,
+                                   applepay_checked=browser == 'safari')
 
     with open(filepath, 'a', newline='', encoding='utf-8') as f:
         writer = csv.writer(f)
         writer.writerow(row)
 
 
+def take_failure_screenshot(driver, store_id: str, terminal_id: str, failures: List[str], suffix: str = ''):
+    # Priority order: Timer > Zipcode > Store Name issues > Visual > Other
+    if any("Timer" in failure for failure in failures):
+        prefix = "TP"
+    elif any("Postal code field not found" in failure for failure in failures):
+        prefix = "NZ"
+    elif "No Store Name" in str(failures) or "Store name element exists but is empty" in str(failures):
+        prefix = "NSN"
+    elif any("Store name mismatch" in failure for failure in failures):
+        prefix = "SNM"
+    elif any("Visual" in failure for failure in failures):
+        prefix = "VIS"
+    else:
+        prefix = "CRIT"
+
+    take_screenshot(driver, store_id, f"{prefix}_{store_id}_{terminal_id}{suffix}")
+
+
+def validate_checkout_page(driver, checkout_url: str, store_id: str, property_id: str, dba_name: str,
+                           is_safari: bool = False, network_checks: bool = False,
+                           visual_baselines=None) -> Tuple[Dict[str, bool], str, str, List[str]]:
+    """Open a checkout URL and run every page check; returns (results, timer_value, visual_status, failures)."""
+    from src.pages.base_page import BasePage
+    from src.locators.store_locators import CommonLocators, SafariLocators
+    from src.utils.network_capture import CheckoutNetworkCapture
+
+    base_page = BasePage(driver)
+    failures = []
+    timer_value = "Not Found"
+    visual_status = 'N/A'
+
+    results = {
+        'timer_present': False,
+        'timer_correct': False,
+        'googlepay_present': False,
+        'applepay_present': False,
+        'store_name_match': False,
+        'postal_code_present': False
+    }
+
+    network_capture = None
+    if network_checks and CheckoutNetworkCapture.is_supported(driver):
+        network_capture = CheckoutNetworkCapture(driver)
+        network_capture.start()
+
+    driver.get(checkout_url)
+
+    # Facts left as None by the network capture are checked in the DOM
+    network_facts = network_capture.collect() if network_capture else {}
+
+    try:
+        # The timer only counts as present once it renders; the network may supply its value
+        timer_element = base_page.wait_for_element_visible(CommonLocators.TIMER)
+        results['timer_present'] = True
+        if network_facts.get('timer_value') is not None:
+            timer_text = network_facts['timer_value']
+        else:
+            timer_text = timer_element.get_attribute('textContent')
+
+        if timer_text is None:
+            timer_value = "No timer text found"
+            results['timer_correct'] = False
+            failures.append(f"Timer text is empty")
+        else:
+            timer_value = timer_text.strip()
+            results['timer_correct'] = timer_value.startswith(('05:00', '04:59', '04:58'))
+            if not results['timer_correct']:
+                failures.append(f"Timer started with incorrect value: {timer_value}. Expected: 05:00 or 04:59")
+
+    except Exception as e:
+        results['timer_present'] = False
+        results['timer_correct'] = False
+        timer_value = "Timer not found"
+        failures.append(f"Timer check failed: {str(e)}")
+
+    try:
+        # Only a positive network value skips the DOM wait; a False is confirmed on the page
+        if network_facts.get('googlepay_present'):
+            results['googlepay_present'] = True
+        else:
+            results['googlepay_present'] = base_page.is_element_present(CommonLocators.GOOGLE_PAY_BUTTON)
+        if not results['googlepay_present']:
+            failures.append("Google Pay button not found")
+    except Exception as e:
+        results['googlepay_present'] = False
+        failures.append(f"Google Pay check failed: {str(e)}")
+
+    if is_safari:
+        try:
+            results['applepay_present'] = base_page.is_element_present(SafariLocators.APPLE_PAY_BUTTON)
+            if not results['applepay_present']:
+                failures.append("Apple Pay button not found")
+        except Exception as e:
+            results['applepay_present'] = False
+            failures.append(f"Apple Pay check failed: {str(e)}")
+
+    # Store name check
+    try:
+        actual_store_name = network_facts.get('store_name')
+        store_name_element = actual_store_name is not None or base_page.is_element_present(CommonLocators.STORE_NAME)
+        
+        if not store_name_element:
+            results['store_name_match'] = False
+            failures.append("No store name found on page")
+        else:
+            if actual_store_name is None:
+                actual_store_name = base_page.get_text(CommonLocators.STORE_NAME)
+            elif dba_name and dba_name != "N/A" and dba_name not in actual_store_name:
+                # Confirm a mismatching network value against the page before reporting it
+                if base_page.is_element_present(CommonLocators.STORE_NAME):
+                    actual_store_name = base_page.get_text(CommonLocators.STORE_NAME)
+            print(f"\nStore name comparison:")
+            print(f"DBA Name from CSV: {dba_name}")
+            print(f"Store Name from website: {actual_store_name}")
+            
+            if not actual_store_name or actual_store_name.strip() == "":
+                results['store_name_match'] = False
+                failures.append("Store name element exists but is empty")
+            else:
+                if not dba_name or dba_name == "N/A":
+                    results['store_name_match'] = False
+                else:
+                    # We have a DBA name, check if it matches
+                    results['store_name_match'] = dba_name in actual_store_name
+                    if not results['store_name_match']:
+                        failures.append(f"Store name mismatch. Expected: {dba_name}, Got: {actual_store_name}")
+        
+    except Exception as e:
+        results['store_name_match'] = False
+        failures.append("Store name check failed: No store name found on page")
+
+    try:
+        base_page.switch_to_frame(CommonLocators.CARD_FRAME)
+        results['postal_code_present'] = base_page.is_element_present(CommonLocators.POSTAL_CODE_FIELD)
+        if not results['postal_code_present']:
+            failures.append("Postal code field not found")
+        base_page.switch_to_default_content()
+    except Exception as e:
+        results['postal_code_present'] = False
+        failures.append(f"Postal code check failed: {str(e)}")
+        base_page.switch_to_default_content()
+
+    if visual_baselines is not None:
+        from src.utils.visual_regression import perceptual_hash
+
+        try:
+            card_element = base_page.wait_for_element_visible(CommonLocators.CARD_FRAME)
+            card_hash = perceptual_hash(card_element.screenshot_as_png)
+            visual_status, distance = visual_baselines.compare(store_id, property_id, card_hash)
+            if visual_status == 'FAIL':
+                failures.append(f"Visual mismatch: checkout card differs from baseline by {distance} bits")
+        except Exception as e:
+            visual_status = 'FAIL'
+            failures.append(f"Visual check failed: {str(e)}")
+
+    return results, timer_value, visual_status, failures
+
+
 class TestFreedomPayAPI:
     total_tests = 0
     passed_tests = 0
@@ -277,17 +492,27 @@ class TestFreedomPayAPI:
         TestFreedomPayAPI.critical_failures = 0
 
     @pytest.fixture
-    def store_data(self) -> List[Tuple[str, str, str, str, str, str, str, str]]:
+    def store_data(self) -> Tuple[Tuple[str, str, str, str, str, str, str, str], ...]:
         return read_store_data('src/data/stores.csv')
 
     @pytest.mark.parametrize("store_tuple", read_store_data('src/data/stores.csv'))
-    def test_create_transaction(self, store_tuple, driver):
+    def test_create_transaction(self, store_tuple, request):
         TestFreedomPayAPI.total_tests += 1
         store_id, terminal_id, property_id, revenue_center_id, location_name, revenue_center_name, dba_name, batch = store_tuple
-        base_page = BasePage(driver)
+
+        if request.config.getoption("--http-only"):
+            self._check_checkout_url(store_id, terminal_id)
+            return
+
+        if request.config.getoption("--browser-matrix"):
+            self._check_browser_matrix(store_tuple, request)
+            return
+
+        driver = request.getfixturevalue("driver")
         is_safari = is_mac()
         failures = []
         timer_value = "Not Found"
+        visual_status = 'N/A'
 
         results = {
             'timer_present': False,
@@ -329,102 +554,20 @@ class TestFreedomPayAPI:
             assert isinstance(checkout_url,
                               str), f"Invalid checkout URL format. Expected string, got {type(checkout_url)}"
 
-            driver.get(checkout_url)
-
-            try:
-                timer_element = base_page.wait_for_element_visible(CommonLocators.TIMER)
-                results['timer_present'] = True
-                timer_text = timer_element.get_attribute('textContent')
-
-                if timer_text is None:
-                    timer_value = "No timer text found"
-                    results['timer_correct'] = False
-                    failures.append(f"Timer text is empty")
-                else:
-                    timer_value = timer_text.strip()
-                    results['timer_correct'] = timer_value.startswith(('05:00', '04:59', '04:58'))
-                    if not results['timer_correct']:
-                        failures.append(f"Timer started with incorrect value: {timer_value}. Expected: 05:00 or 04:59")
-
-            except Exception as e:
-                results['timer_present'] = False
-                results['timer_correct'] = False
-                timer_value = "Timer not found"
-                failures.append(f"Timer check failed: {str(e)}")
-
-            try:
-                results['googlepay_present'] = base_page.is_element_present(CommonLocators.GOOGLE_PAY_BUTTON)
-                if not results['googlepay_present']:
-                    failures.append("Google Pay button not found")
-            except Exception as e:
-                results['googlepay_present'] = False
-                failures.append(f"Google Pay check failed: {str(e)}")
-
-            if is_safari:
-                try:
-                    results['applepay_present'] = base_page.is_element_present(SafariLocators.APPLE_PAY_BUTTON)
-                    if not results['applepay_present']:
-                        failures.append("Apple Pay button not found")
-                except Exception as e:
-                    results['applepay_present'] = False
-                    failures.append(f"Apple Pay check failed: {str(e)}")
-
-            # Store name check
-            try:
-                store_name_element = base_page.is_element_present(CommonLocators.STORE_NAME)
-                
-                if not store_name_element:
-                    results['store_name_match'] = False
-                    failures.append("No store name found on page")
-                else:
-                    actual_store_name = base_page.get_text(CommonLocators.STORE_NAME)
-                    print(f"\nStore name comparison:")
-                    print(f"DBA Name from CSV: {dba_name}")
-                    print(f"Store Name from website: {actual_store_name}")
-                    
-                    if not actual_store_name or actual_store_name.strip() == "":
-                        results['store_name_match'] = False
-                        failures.append("Store name element exists but is empty")
-                    else:
-                        if not dba_name or dba_name == "N/A":
-                            results['store_name_match'] = False
-                        else:
-                            # We have a DBA name, check if it matches
-                            results['store_name_match'] = dba_name in actual_store_name
-                            if not results['store_name_match']:
-                                failures.append(f"Store name mismatch. Expected: {dba_name}, Got: {actual_store_name}")
-                
-            except Exception as e:
-                results['store_name_match'] = False
-                failures.append("Store name check failed: No store name found on page")
-
-            try:
-                base_page.switch_to_frame((By.CSS_SELECTOR, "iframe#hpc--card-frame"))
-                results['postal_code_present'] = base_page.is_element_present(CommonLocators.POSTAL_CODE_FIELD)
-                if not results['postal_code_present']:
-                    failures.append("Postal code field not found")
-                base_page.switch_to_default_content()
-            except Exception as e:
-                results['postal_code_present'] = False
-                failures.append(f"Postal code check failed: {str(e)}")
-                base_page.switch_to_default_content()
+            results, timer_value, visual_status, failures = validate_checkout_page(
+                driver, checkout_url, store_id, property_id, dba_name,
+                is_safari=is_safari,
+                network_checks=request.config.getoption("--network-checks"),
+                visual_baselines=request.getfixturevalue("visual_baselines")
+            )
 
             write_timer_to_file(store_id, terminal_id, dba_name, property_id, revenue_center_id, timer_value)
             write_results_to_csv(store_id, terminal_id, property_id, revenue_center_id,
-                                 location_name, revenue_center_name, dba_name, results, timer_value, batch, failures)
+                                 location_name, revenue_center_name, dba_name, results, timer_value, batch, failures,
+                                 visual_status)
 
             if failures:
-                # Priority order: Timer > Zipcode > Store Name issues > Other
-                if any("Timer" in failure for failure in failures):
-                    take_screenshot(driver, store_id, f"TP_{store_id}_{terminal_id}")
-                elif any("Postal code field not found" in failure for failure in failures):
-                    take_screenshot(driver, store_id, f"NZ_{store_id}_{terminal_id}")
-                elif "No Store Name" in str(failures) or "Store name element exists but is empty" in str(failures):
-                    take_screenshot(driver, store_id, f"NSN_{store_id}_{terminal_id}")
-                elif any("Store name mismatch" in failure for failure in failures):
-                    take_screenshot(driver, store_id, f"SNM_{store_id}_{terminal_id}")
-                else:
-                    take_screenshot(driver, store_id, f"CRIT_{store_id}_{terminal_id}")
+                take_failure_screenshot(driver, store_id, terminal_id, failures)
 
                 for failure in failures:
                     write_failure_to_file(store_id, terminal_id, dba_name, property_id, revenue_center_id, failure)
@@ -437,7 +580,8 @@ class TestFreedomPayAPI:
         except AssertionError as e:
             write_timer_to_file(store_id, terminal_id, dba_name, property_id, revenue_center_id, timer_value)
             write_results_to_csv(store_id, terminal_id, property_id, revenue_center_id,
-                                 location_name, revenue_center_name, dba_name, results, timer_value, batch, failures)
+                                 location_name, revenue_center_name, dba_name, results, timer_value, batch, failures,
+                                 visual_status)
             write_failure_to_file(store_id, terminal_id, dba_name, property_id, revenue_center_id, str(e))
 
             screenshot_name = f"CRIT_{store_id}_{terminal_id}_assertion_error"
@@ -447,13 +591,101 @@ class TestFreedomPayAPI:
         except Exception as e:
             screenshot_name = f"CRIT_{store_id}_{terminal_id}_error"
             try:
-                driver.save_screenshot(os.path.join("results", "screenshots", f"{screenshot_name}.png"))
+                take_screenshot(driver, store_id, screenshot_name)
             except Exception as screenshot_error:
                 print(f"Failed to take screenshot: {str(screenshot_error)}")
 
             write_failure_to_file(store_id, terminal_id, dba_name, property_id, revenue_center_id, str(e))
             raise
 
+    def _check_browser_matrix(self, store_tuple, request):
+        store_id, terminal_id, property_id, revenue_center_id, location_name, revenue_center_name, dba_name, batch = store_tuple
+        drivers = request.getfixturevalue("matrix_drivers")
+        browsers = list(drivers)
+        network_checks = request.config.getoption("--network-checks")
+        visual_baselines = request.getfixturevalue("visual_baselines")
+
+        # One transaction per store, shared by every browser in the matrix
+        try:
+            response = create_freedom_pay_transaction(store_id, terminal_id)
+        except Exception as e:
+            error_msg = f"API Request Failed: {str(e)}"
+            write_failure_to_file(store_id, terminal_id, dba_name, property_id, revenue_center_id, error_msg)
+            TestFreedomPayAPI.critical_failures += 1
+            TestFreedomPayAPI.failed_tests += 1
+            pytest.fail(error_msg)
+
+        checkout_url = response.get('CheckoutUrl')
+        if not checkout_url or not checkout_url.startswith("https://"):
+            error_msg = f"Store not configured. API Response: {response.get('ResponseMessage', 'No message')}"
+            write_failure_to_file(store_id, terminal_id, dba_name, property_id, revenue_center_id, error_msg)
+            invalid = ({}, "Invalid URL - Unable to access", 'N/A')
+            write_matrix_results_to_csv(store_id, terminal_id, property_id, revenue_center_id, location_name,
+                                        revenue_center_name, dba_name, batch, browsers,
+                                        {browser: invalid for browser in browsers})
+            TestFreedomPayAPI.critical_failures += 1
+            TestFreedomPayAPI.failed_tests += 1
+            pytest.skip(error_msg)
+
+        with ThreadPoolExecutor(max_workers=len(browsers)) as executor:
+            futures = {
+                browser: executor.submit(
+                    validate_checkout_page, driver, checkout_url, store_id, property_id, dba_name,
+                    is_safari=browser == 'safari',
+                    network_checks=network_checks,
+                    # Engines render the card differently, so each keeps its own baselines
+                    visual_baselines=visual_baselines.for_variant(browser) if visual_baselines else None
+                )
+                for browser, driver in drivers.items()
+            }
+
+        browser_results = {}
+        browser_failures = {}
+        for browser, future in futures.items():
+            try:
+                results, timer_value, visual_status, failures = future.result()
+            except Exception as e:
+                results, timer_value, visual_status, failures = {}, "Page error", 'N/A', [f"Page load failed: {str(e)}"]
+            browser_results[browser] = (results, timer_value, visual_status)
+            write_timer_to_file(store_id, terminal_id, dba_name, property_id, revenue_center_id, timer_value,
+                                browser)
+            if failures:
+                browser_failures[browser] = failures
+
+        write_matrix_results_to_csv(store_id, terminal_id, property_id, revenue_center_id, location_name,
+                                    revenue_center_name, dba_name, batch, browsers, browser_results)
+
+        if browser_failures:
+            for browser, failures in browser_failures.items():
+                try:
+                    take_failure_screenshot(drivers[browser], store_id, terminal_id, failures, f"_{browser}")
+                except Exception as screenshot_error:
+                    print(f"Failed to take screenshot: {str(screenshot_error)}")
+                for failure in failures:
+                    write_failure_to_file(store_id, terminal_id, dba_name, property_id, revenue_center_id,
+                                          f"[{browser}] {failure}")
+
+            TestFreedomPayAPI.failed_tests += 1
+            pytest.fail(f"Store {store_id} failed in: {', '.join(browser_failures)}")
+        else:
+            TestFreedomPayAPI.passed_tests += 1
+
+    def _check_checkout_url(self, store_id: str, terminal_id: str):
+        try:
+            response = create_freedom_pay_transaction(store_id, terminal_id)
+        except Exception as e:
+            TestFreedomPayAPI.critical_failures += 1
+            TestFreedomPayAPI.failed_tests += 1
+            pytest.fail(f"API Request Failed for store {store_id}: {str(e)}")
+
+        checkout_url = response.get('CheckoutUrl')
+        if not checkout_url or not checkout_url.startswith("https://"):
+            TestFreedomPayAPI.critical_failures += 1
+            TestFreedomPayAPI.failed_tests += 1
+            pytest.fail(f"Store not configured. API Response: {response.get('ResponseMessage', 'No message')}")
+
+        TestFreedomPayAPI.passed_tests += 1
+
     @pytest.fixture(scope="session", autouse=True)
     def _print_summary(self, request):
         """Print summary after all tests are done"""
@@ -469,6 +701,21 @@ class TestFreedomPayAPI:
             print(f"Critical Failures: {TestFreedomPayAPI.critical_failures}")
             print("=" * 50 + "\n")
 
+            if request.config.getoption("--run-diff"):
+                timestamp = datetime.now().strftime('%Y-%m-%d')
+                current_results = os.path.join("results", f"test_results_{timestamp}.csv")
+
+                # Matrix and HTTP-only runs write no test_results file, so older runs would be diffed instead
+                if request.config.getoption("--browser-matrix") or request.config.getoption("--http-only"):
+                    print("Run diff skipped: --browser-matrix and --http-only runs write no test_results file\n")
+                elif not os.path.exists(current_results):
+                    print(f"Run diff skipped: this run wrote no {current_results}\n")
+                else:
+                    from src.utils.run_diff import write_run_diff
+
+                    report = write_run_diff(runs=request.config.getoption("--run-diff-runs"))
+                    print(report if report else "Run diff skipped: fewer than two results files\n")
+
         request.addfinalizer(print_summary)
 
 
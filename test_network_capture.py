@@ -0,0 +1,111 @@
+import json
+
+from src.utils.network_capture import CheckoutNetworkCapture
+
+
+def event(method, **params):
+    return {'message': json.dumps({'message': {'method': method, 'params': params}})}
+
+
+def document(request_id='doc'):
+    return [
+        event('Network.requestWillBeSent', requestId=request_id),
+        event('Network.responseReceived', requestId=request_id, type='Document',
+              response={'mimeType': 'text/html'}),
+        event('Network.loadingFinished', requestId=request_id)
+    ]
+
+
+def xhr(request_id, finished=True):
+    events = [
+        event('Network.requestWillBeSent', requestId=request_id),
+        event('Network.responseReceived', requestId=request_id, type='XHR',
+              response={'mimeType': 'application/json'})
+    ]
+    if finished:
+        events.append(event('Network.loadingFinished', requestId=request_id))
+    return events
+
+
+class FakeDriver:
+    """Serves one batch of performance log entries per get_log call."""
+
+    def __init__(self, batches, bodies):
+        self.batches = list(batches)
+        self.bodies = bodies
+        self.log_calls = 0
+
+    def get_log(self, log_type):
+        self.log_calls += 1
+        return self.batches.pop(0) if self.batches else []
+
+    def execute_cdp_cmd(self, command, params):
+        if command == 'Network.getResponseBody':
+            return self.bodies[params['requestId']]
+        return {}
+
+
+def collect(batches, bodies, max_wait=1):
+    # start() drains the first get_log call, as it would for an earlier page
+    capture = CheckoutNetworkCapture(FakeDriver([[]] + batches, bodies), max_wait=max_wait, poll_interval=0.01)
+    capture.start()
+    return capture, capture.collect()
+
+
+HTML = {'body': '<h1 class="navbar-store">Red &amp; Grill</h1><span id="timerText">05:00</span>'}
+
+
+def test_html_only_page_stops_when_idle():
+    capture, facts = collect([document()], {'doc': HTML})
+
+    assert facts == {'store_name': 'Red & Grill', 'googlepay_present': None, 'timer_value': '05:00'}
+    assert capture.is_idle()
+
+
+def test_waits_for_late_xhr_and_stops_when_complete():
+    batches = [document() + xhr('config', finished=False)[:2], [], xhr('config')[1:]]
+    bodies = {'doc': HTML, 'config': {'body': '{"checkout": {"GooglePayEnabled": true}}'}}
+
+    capture, facts = collect(batches, bodies)
+
+    assert facts['googlepay_present'] is True
+    assert capture.is_complete()
+
+
+def test_in_flight_request_keeps_capture_open_until_it_fails():
+    batches = [document() + [event('Network.requestWillBeSent', requestId='img')], [],
+               [event('Network.loadingFailed', requestId='img')]]
+
+    capture, facts = collect(batches, {'doc': HTML})
+
+    assert capture.is_idle()
+    assert capture.driver.log_calls >= 4
+
+
+def test_base64_bodies_are_ignored():
+    capture, facts = collect([document()], {'doc': {'body': 'PGgxPg==', 'base64Encoded': True}})
+
+    assert facts == {'store_name': None, 'googlepay_present': None, 'timer_value': None}
+
+
+def test_generic_and_echoed_json_keys_are_ignored():
+    body = {'body': json.dumps({
+        'merchantInfo': {'merchantName': 'Google Merchant'},
+        'paymentMethods': [{'displayName': 'Card'}],
+        'TimeoutMinutes': 5,
+        'StoreName': 'Red Mountain Grill BHM',
+        'RemainingSeconds': 299
+    })}
+
+    capture, facts = collect([document() + xhr('config')], {'doc': {'body': '<html></html>'}, 'config': body})
+
+    assert facts['store_name'] == 'Red Mountain Grill BHM'
+    assert facts['timer_value'] == '04:59'
+
+
+def test_max_wait_caps_requests_that_never_finish():
+    capture, facts = collect([document() + [event('Network.requestWillBeSent', requestId='socket')]],
+                             {'doc': {'body': '<html></html>'}}, max_wait=0.05)
+
+    assert not capture.is_idle()
+    assert facts['store_name'] is None
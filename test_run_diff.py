@@ -0,0 +1,56 @@
+import csv
+
+from src.utils.run_diff import CHECK_COLUMNS, classify, diff_runs, load_runs
+
+HEADERS = ['Batch', 'Store ID', 'Terminal ID', 'Property ID'] + list(CHECK_COLUMNS)
+
+
+def write_run(path, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADERS)
+        for store_id, property_id, timer in rows:
+            writer.writerow(['1', store_id, f"T{store_id}", property_id, timer, 'PASS', 'N/A', 'PASS'])
+    return str(path)
+
+
+def test_classify():
+    assert classify(['PASS', 'FAIL']) == 'newly failing'
+    assert classify(['FAIL', 'PASS']) == 'newly fixed'
+    assert classify(['PASS', 'FAIL', 'PASS']) == 'flapping'
+    assert classify(['PASS', 'PASS']) is None
+    assert classify([None, 'FAIL']) is None
+
+
+def test_classify_ignores_gaps_before_latest_run():
+    assert classify(['PASS', None, 'FAIL']) == 'newly failing'
+    assert classify(['FAIL', None, 'PASS']) == 'newly fixed'
+
+
+def test_classify_requires_latest_run_status():
+    assert classify(['PASS', 'FAIL', None]) is None
+    assert classify(['FAIL', 'PASS', None]) is None
+
+
+def test_load_runs_last_row_wins_and_skips_non_status_values(tmp_path):
+    path = write_run(tmp_path / 'test_results_2026-01-01.csv', [('1', '10', 'PASS'), ('1', '10', 'FAIL')])
+
+    statuses = load_runs([path])[('1', 'T1')]['statuses']
+
+    assert statuses['Timer'] == ['FAIL']
+    assert statuses['DB Name Match'] == [None]
+
+
+def test_diff_runs_groups_by_property(tmp_path):
+    paths = [
+        write_run(tmp_path / 'test_results_2026-01-01.csv', [('1', '10', 'PASS'), ('2', '20', 'FAIL'), ('3', '10', 'PASS')]),
+        write_run(tmp_path / 'test_results_2026-01-02.csv', [('1', '10', 'PASS'), ('2', '20', 'FAIL'), ('3', '10', 'FAIL')]),
+        write_run(tmp_path / 'test_results_2026-01-03.csv', [('1', '10', 'FAIL'), ('2', '20', 'PASS')])
+    ]
+
+    report = diff_runs(paths)
+
+    assert report['10']['newly failing'] == [('1', 'T1', 'Timer')]
+    assert report['20']['newly fixed'] == [('2', 'T2', 'Timer')]
+    assert all(not groups['flapping'] for groups in report.values())
+    assert ('3', 'T3', 'Timer') not in report['10']['newly failing']
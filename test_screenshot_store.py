@@ -0,0 +1,129 @@
+import os
+
+from src.utils import screenshot_store
+from src.utils.screenshot_store import ScreenshotStore
+
+DAY = 86400
+NOW = 1_800_000_000
+
+
+def put_at(monkeypatch, store, name, data, saved):
+    monkeypatch.setattr(screenshot_store.time, 'time', lambda: saved)
+    path = store.put(name, data)
+    monkeypatch.undo()
+    return path
+
+
+def object_count(store):
+    if not os.path.isdir(store.objects_dir):
+        return 0
+    return sum(len(files) for _, _, files in os.walk(store.objects_dir))
+
+
+def test_identical_images_share_one_object(tmp_path):
+    store = ScreenshotStore(str(tmp_path))
+
+    first = store.put('TP_1_1', b'error page')
+    second = store.put('NZ_2_2', b'error page')
+
+    assert first == second
+    assert store.resolve('TP_1_1') == store.resolve('NZ_2_2') == first
+    assert object_count(store) == 1
+
+
+def test_age_pruning_keeps_objects_still_referenced(tmp_path, monkeypatch):
+    store = ScreenshotStore(str(tmp_path))
+    put_at(monkeypatch, store, 'TP_old', b'shared', NOW - 30 * DAY)
+    put_at(monkeypatch, store, 'NZ_new', b'shared', NOW - DAY)
+    put_at(monkeypatch, store, 'SNM_old', b'only old', NOW - 30 * DAY)
+
+    monkeypatch.setattr(screenshot_store.time, 'time', lambda: NOW)
+    stats = store.compact(max_age_days=14)
+
+    assert stats['refs_removed'] == 2
+    assert stats['objects_removed'] == 1
+    assert store.resolve('TP_old') is None
+    assert store.resolve('SNM_old') is None
+    assert os.path.exists(store.resolve('NZ_new'))
+    assert object_count(store) == 1
+
+
+def test_loose_pngs_are_pruned_by_age(tmp_path, monkeypatch):
+    store = ScreenshotStore(str(tmp_path))
+    old = tmp_path / 'CRIT_1_1.png'
+    recent = tmp_path / 'CRIT_2_2.png'
+    old.write_bytes(b'old')
+    recent.write_bytes(b'recent')
+    os.utime(old, (NOW - 30 * DAY, NOW - 30 * DAY))
+    os.utime(recent, (NOW - DAY, NOW - DAY))
+
+    monkeypatch.setattr(screenshot_store.time, 'time', lambda: NOW)
+    stats = store.compact(max_age_days=14)
+
+    assert stats['loose_removed'] == 1
+    assert not old.exists()
+    assert recent.exists()
+
+
+def test_size_budget_evicts_least_recently_used_first(tmp_path, monkeypatch):
+    store = ScreenshotStore(str(tmp_path))
+    put_at(monkeypatch, store, 'TP_a', b'a' * 1000, NOW - 3 * DAY)
+    put_at(monkeypatch, store, 'TP_b', b'b' * 1000, NOW - 2 * DAY)
+    put_at(monkeypatch, store, 'TP_c', b'c' * 1000, NOW - DAY)
+    # A newer reference keeps the oldest object in use
+    put_at(monkeypatch, store, 'NZ_a', b'a' * 1000, NOW)
+
+    stats = store.compact(max_size_mb=2000 / 1024 / 1024)
+
+    assert stats['objects_removed'] == 1
+    assert store.resolve('TP_b') is None
+    assert os.path.exists(store.resolve('TP_a'))
+    assert os.path.exists(store.resolve('NZ_a'))
+    assert os.path.exists(store.resolve('TP_c'))
+
+
+def test_size_budget_tie_evicts_largest_first(tmp_path, monkeypatch):
+    store = ScreenshotStore(str(tmp_path))
+    put_at(monkeypatch, store, 'TP_small', b'a' * 1000, NOW)
+    put_at(monkeypatch, store, 'SNM_large', b'b' * 3000, NOW)
+
+    stats = store.compact(max_size_mb=2500 / 1024 / 1024)
+
+    assert stats['objects_kept'] == 1
+    assert store.resolve('SNM_large') is None
+    assert os.path.exists(store.resolve('TP_small'))
+
+
+def test_unreferenced_objects_are_deleted(tmp_path):
+    store = ScreenshotStore(str(tmp_path))
+    store.put('TP_1_1', b'kept')
+    orphan = store.object_path('ff' * 32)
+    os.makedirs(os.path.dirname(orphan), exist_ok=True)
+    with open(orphan, 'wb') as f:
+        f.write(b'orphan')
+
+    stats = store.compact()
+
+    assert stats['objects_removed'] == 1
+    assert not os.path.exists(orphan)
+    assert os.path.exists(store.resolve('TP_1_1'))
+
+
+def test_release_keeps_a_lock_taken_over_by_another_holder(tmp_path):
+    store = ScreenshotStore(str(tmp_path))
+
+    with store.locked():
+        with open(store.lock_path, 'w', encoding='utf-8') as f:
+            f.write('other:holder')
+
+    with open(store.lock_path, 'r', encoding='utf-8') as f:
+        assert f.read() == 'other:holder'
+
+
+def test_release_tolerates_a_removed_lock(tmp_path):
+    store = ScreenshotStore(str(tmp_path))
+
+    with store.locked():
+        os.remove(store.lock_path)
+
+    assert store.put('TP_1_1', b'after')